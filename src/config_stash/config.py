@@ -0,0 +1,151 @@
+import os
+import sys
+from typing import Any
+
+from config_stash.loaders import EnvLoader
+from config_stash.loaders import MultipleEnvLoader
+from config_stash.loaders import PrefixedEnvLoader
+from config_stash.loaders import VaultLoader
+from config_stash.loaders import YamlLoader
+from config_stash.vault_fetcher import VaultFetcher
+
+_ENV_LOADER = EnvLoader()
+_MULTIPLE_ENV_LOADER = MultipleEnvLoader()
+_PREFIXED_ENV_LOADER = PrefixedEnvLoader()
+_VAULT_LOADER = VaultLoader()
+_YAML_LOADER = YamlLoader()
+_VAULT_FETCHER = VaultFetcher()
+
+
+class _LazySecret:
+    """Deferred Vault secret, fetched once on first access through Config."""
+
+    __slots__ = ('_loader', '_path', '_key', '_vault_fetcher', '_value', '_loaded')
+
+    def __init__(self, loader: Any, vault_secret_path: str, vault_secret_key: str, vault_fetcher: Any):
+        self._loader = loader
+        self._path = vault_secret_path
+        self._key = vault_secret_key
+        self._vault_fetcher = vault_fetcher
+        self._value = None
+        self._loaded = False
+
+    def resolve(self) -> Any:
+        if not self._loaded:
+            self._value = self._loader.load(self._path, self._key, self._vault_fetcher)
+            self._loaded = True
+        return self._value
+
+    def __str__(self) -> str:
+        return str(self.resolve())
+
+
+class Config(dict):
+    """Dict-like store of configuration values.
+
+    Every value stored in the config is mirrored into ``os.environ``.
+    """
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        if isinstance(value, _LazySecret):
+            # Mirroring a lazy secret would force the fetch; the environment
+            # is synced when the secret is first read instead.
+            return
+        str_value = value if type(value) is str else str(value)
+        if os.environ.get(key) != str_value:
+            os.environ[key] = str_value
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if isinstance(value, _LazySecret):
+            value = value.resolve()
+            self[key] = value
+        return value
+
+    def invalidate_cache(self) -> None:
+        """Drop cached Vault secrets and env values so the next load re-fetches."""
+        VaultLoader.invalidate_cache()
+        EnvLoader.invalidate_cache()
+
+    def _raw_set(self, key: str, value: Any) -> None:
+        """Direct C-level insert for bulk internal loops.
+
+        Skips the os.environ mirror (callers use it for values read from the
+        environment) and interns string keys so later lookups take the
+        identity fast path.
+        """
+        dict.__setitem__(self, sys.intern(key) if type(key) is str else key, value)
+
+    def _bulk_update(self, values: dict, sync_env: bool = True) -> None:
+        """Insert many values at once, bypassing the per-key __setitem__ override.
+
+        ``sync_env=False`` skips the os.environ mirroring entirely, for values
+        that were just read from the environment.
+        """
+        dict.update(self, values)
+        if not sync_env:
+            return
+        env = os.environ
+        changed = {}
+        for key, value in values.items():
+            str_value = value if type(value) is str else str(value)
+            if env.get(key) != str_value:
+                changed[key] = str_value
+        if changed:
+            # One update call batches the putenv work instead of paying the
+            # MutableMapping __setitem__ machinery per key.
+            env.update(changed)
+
+    def load_from_env(self, key: str, custom_key_name: str = None, loader: Any = None) -> None:
+        loader = loader or _ENV_LOADER
+        value = loader.load(key)
+        if custom_key_name:
+            self[custom_key_name] = value
+        else:
+            self[key] = value
+
+    def load_many_keys_from_env(self, keys: list, loader: Any = None) -> None:
+        loader = loader or _MULTIPLE_ENV_LOADER
+        try:
+            values = loader.load(keys)
+        except KeyError:
+            # Keep the keys that are set before surfacing the missing one, so
+            # a single bad entry doesn't discard the whole batch.
+            env = os.environ
+            present = {key: env[key] for key in keys if key in env}
+            self._bulk_update(present, sync_env=False)
+            raise
+        self._bulk_update(values, sync_env=False)
+
+    def load_prefixed_env_vars(self, allowed_prefixes: list, loader: Any = None) -> None:
+        loader = loader or _PREFIXED_ENV_LOADER
+        values = loader.load(allowed_prefixes)
+        for key in values.keys() - self.keys():
+            self._raw_set(key, values[key])
+
+    def load_from_vault(
+        self,
+        vault_secret_path: str,
+        vault_secret_key: str,
+        custom_key_name: str = None,
+        loader: Any = None,
+        vault_fetcher: Any = None,
+        lazy: bool = False,
+    ) -> None:
+        loader = loader or _VAULT_LOADER
+        vault_fetcher = vault_fetcher or _VAULT_FETCHER
+        if lazy:
+            value = _LazySecret(loader, vault_secret_path, vault_secret_key, vault_fetcher)
+        else:
+            value = loader.load(vault_secret_path, vault_secret_key, vault_fetcher)
+        if custom_key_name:
+            self[custom_key_name] = value
+        else:
+            self[vault_secret_key] = value
+
+    def load_from_yaml_file(self, filepath: str, loader: Any = None, vault_fetcher: Any = None) -> None:
+        loader = loader or _YAML_LOADER
+        vault_fetcher = vault_fetcher or _VAULT_FETCHER
+        values = loader.load(filepath, vault_fetcher)
+        self._bulk_update(values)
@@ -0,0 +1,384 @@
+import copy
+import functools
+import os
+import sys
+import threading
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any
+
+_YAML_CACHE_ENV_FLAG = "CONFIG_STASH_YAML_CACHE"
+
+# Sidecar cache serialization: orjson when available (C extension, no
+# arbitrary-code concerns on load), stdlib json otherwise. Parsed YAML
+# trees are plain dict/list/str/number data, so JSON shape is enough.
+try:
+    import orjson
+
+    _cache_dumps = orjson.dumps
+    _cache_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _cache_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _cache_loads = json.loads
+
+# Bound once at import so the hot paths skip the module attribute lookup.
+# os.environ is a process-wide singleton, so the alias always sees updates.
+_environ = os.environ
+
+# PyYAML is imported on first parse so env-only callers (EnvLoader and
+# friends) don't pay its import cost at startup. The bindings are memoized
+# here, keeping the per-call overhead at one global load after warm-up.
+_yaml_load = None
+_Loader = None
+
+
+def _get_yaml():
+    global _yaml_load, _Loader
+    if _yaml_load is None:
+        import yaml
+
+        _Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        _yaml_load = yaml.load
+    return _yaml_load, _Loader
+
+
+# Parsed-tree cache keyed by absolute path. Keying by path (with mtime/size
+# checked on lookup) means editing a file replaces its entry instead of
+# leaving a stale one behind, which an lru_cache keyed on (path, mtime, size)
+# would do.
+_YAML_CACHE: OrderedDict = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+
+def _parse_yaml_file(abspath: str, mtime_ns: int, size: int) -> dict:
+    entry = _YAML_CACHE.get(abspath)
+    if entry is not None and entry[0] == mtime_ns and entry[1] == size:
+        _YAML_CACHE.move_to_end(abspath)
+        return entry[2]
+    yaml_load, loader_cls = _get_yaml()
+    # Binary mode: libyaml does its own utf-8 decoding, so this skips the
+    # TextIOWrapper codec layer between the file and the parser.
+    with open(abspath, 'rb') as file:
+        yaml_data = yaml_load(file, Loader=loader_cls)
+    _YAML_CACHE[abspath] = (mtime_ns, size, yaml_data)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+    return yaml_data
+
+
+# Fetchers shared per (address, token) pair so repeated loads reuse one
+# client instead of re-reading credentials and rebuilding per call. The lock
+# keeps concurrent first-time loads from racing the insert.
+_VAULT_FETCHERS: dict = {}
+_VAULT_FETCHERS_LOCK = threading.Lock()
+
+
+def _shared_vault_fetcher() -> Any:
+    credentials = (os.environ['VAULT_ADDR'], os.environ['VAULT_TOKEN'])
+    with _VAULT_FETCHERS_LOCK:
+        fetcher = _VAULT_FETCHERS.get(credentials)
+        if fetcher is None:
+            from config_stash.vault_fetcher import VaultFetcher
+
+            fetcher = _VAULT_FETCHERS[credentials] = VaultFetcher()
+    return fetcher
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_vault_fetch(vault_fetcher: Any, vault_secret_path: str, vault_secret_key: str) -> Any:
+    return vault_fetcher.get_value_from_vault(vault_secret_path, vault_secret_key)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_env_fetch(key: str) -> str:
+    try:
+        return _environ[key]
+    except KeyError:
+        raise KeyError(f"Environment variable {key} isn't set.") from None
+
+
+class Loader(ABC):
+    """Base interface for every config-stash loader."""
+
+    @abstractmethod
+    def load(self, *args: Any, **kwargs: Any) -> Any:
+        """Load configuration values from the loader source."""
+
+
+class EnvLoader(Loader):
+    """Loads a single value from an environment variable.
+
+    ``cached=True`` memoizes lookups for the life of the process; it is
+    opt-in because the environment can legitimately change mid-run.
+    An explicit ``env`` mapping replaces ``os.environ`` as the source,
+    which keeps tests hermetic; caching only applies to the real environ.
+    """
+
+    def __init__(self, cached: bool = False, env: Any = None):
+        self.cached = cached
+        self._env = _environ if env is None else env
+
+    def load(self, key: str) -> str:
+        if self.cached and self._env is _environ:
+            return _cached_env_fetch(key)
+        try:
+            return self._env[key]
+        except KeyError:
+            raise KeyError(f"Environment variable {key} isn't set.") from None
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        _cached_env_fetch.cache_clear()
+
+
+class MultipleEnvLoader(Loader):
+    """Loads several environment variables at once."""
+
+    def __init__(self, env: Any = None):
+        self._env = _environ if env is None else env
+
+    def load(self, keys: list) -> dict:
+        env = self._env
+        missing = [key for key in keys if key not in env]
+        if missing:
+            raise KeyError(f"Environment variable {missing[0]} isn't set.")
+        return {key: env[key] for key in keys}
+
+
+class PrefixedEnvLoader(Loader):
+    """Loads every environment variable whose name starts with one of the allowed prefixes."""
+
+    def __init__(self, env: Any = None):
+        self._env = _environ if env is None else env
+
+    def load(self, allowed_prefixes: list, decode: bool = True) -> dict:
+        # Dedupe so repeated prefixes aren't re-tried per key; longest-first
+        # ordering lets the C matcher settle overlapping prefixes in one try.
+        prefixes = tuple(sorted(set(allowed_prefixes), key=len, reverse=True))
+        if not decode and self._env is _environ:
+            # os.environb skips the filesystem-codec decode for callers that
+            # only need the raw bytes.
+            byte_prefixes = tuple(prefix.encode() for prefix in prefixes)
+            return {key: value for key, value in os.environb.items() if key.startswith(byte_prefixes)}
+        return {key: value for key, value in self._env.items() if key.startswith(prefixes)}
+
+
+class VaultLoader(Loader):
+    """Loads a secret value from Vault through a vault fetcher."""
+
+    def load(self, vault_secret_path: str, vault_secret_key: str, vault_fetcher: Any = None) -> Any:
+        if vault_fetcher is None:
+            vault_fetcher = _shared_vault_fetcher()
+        return _cached_vault_fetch(vault_fetcher, vault_secret_path, vault_secret_key)
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        _cached_vault_fetch.cache_clear()
+
+    def load_many(self, requests: list, vault_fetcher: Any) -> dict:
+        """Resolve many ``(path, key)`` pairs with one Vault read per unique path."""
+        session = getattr(vault_fetcher, 'session', nullcontext)
+        with session():
+            secrets_by_path = {}
+            for vault_secret_path, _ in requests:
+                if vault_secret_path not in secrets_by_path:
+                    secrets_by_path[vault_secret_path] = vault_fetcher.get_secret(vault_secret_path)
+        return {(path, key): secrets_by_path[path][key] for path, key in requests}
+
+    def load_batch(self, requests: list, vault_fetcher: Any) -> dict:
+        """Fetch many ``(path, key)`` pairs over a single fetcher session.
+
+        Unlike load_many this keeps one read per pair, but entering the
+        fetcher's session once amortizes connection and TLS setup across the
+        whole batch.
+        """
+        session = getattr(vault_fetcher, 'session', nullcontext)
+        with session():
+            return {(path, key): vault_fetcher.get_value_from_vault(path, key) for path, key in requests}
+
+
+class YamlLoader(Loader):
+    """Loads configuration values from a YAML file.
+
+    String values prefixed with ``ENV.`` are resolved from environment
+    variables and values prefixed with ``VAULT.`` are resolved from Vault.
+    """
+
+    def __init__(self):
+        self.data = dict()
+        self._pending_vault = []
+        # Marker head -> handler, replacing the if/elif ladder in the walk
+        # with one dict probe. Both handlers share the (value, key, target)
+        # signature.
+        self._dispatch = {
+            'ENV': self._load_env_variable,
+            'VAULT': self._defer_vault_secret,
+        }
+
+    def load(self, filepath: str, vault_fetcher: Any = None) -> dict:
+        # Reset per call: the same loader instance may be reused across files
+        # (Config uses a shared default instance), so state must not leak.
+        self.data = {}
+        self._pending_vault = []
+        yaml_data = self._parse_yaml(filepath)
+        self._load_yaml_data(yaml_data, vault_fetcher)
+        self._resolve_pending_vault(vault_fetcher)
+        return self.data
+
+    def load_many(self, filepaths: list, vault_fetcher: Any = None) -> dict:
+        """Load several YAML files, parsing them in parallel.
+
+        libyaml releases the GIL while parsing, so a small thread pool
+        overlaps the file reads and parses. Marker resolution stays
+        sequential per file, keeping the batched Vault reads intact.
+        Returns a dict mapping each filepath to its loaded data.
+        """
+        if not filepaths:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(8, len(filepaths))) as executor:
+            trees = list(executor.map(self._parse_yaml, filepaths))
+        results = {}
+        for filepath, yaml_data in zip(filepaths, trees):
+            self.data = {}
+            self._pending_vault = []
+            self._load_yaml_data(yaml_data, vault_fetcher)
+            self._resolve_pending_vault(vault_fetcher)
+            results[filepath] = self.data
+        return results
+
+    def _parse_yaml(self, filepath: str) -> dict:
+        stat = os.stat(filepath)
+        cache_enabled = os.environ.get(_YAML_CACHE_ENV_FLAG) == "1"
+        if cache_enabled:
+            cached = self._read_cache_file(filepath, stat)
+            if cached is not None:
+                # The cache loader built a fresh tree, so no deepcopy is needed.
+                return cached
+        yaml_data = _parse_yaml_file(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+        if cache_enabled:
+            self._write_cache_file(filepath, yaml_data)
+        # Deepcopy so the walk (and callers mutating loader.data) can't poison
+        # the cached tree.
+        return copy.deepcopy(yaml_data)
+
+    @staticmethod
+    def _read_cache_file(filepath: str, stat: os.stat_result) -> dict:
+        """Load the serialized sidecar cache, or None when absent or stale.
+
+        The sidecar lives next to the YAML as ``<path>.cache`` and is valid
+        only while it is at least as new as the source file. Only the raw
+        parsed tree is cached: ``ENV.``/``VAULT.`` markers are still resolved
+        on every load, so no resolved secret ever reaches disk.
+        """
+        cache_path = filepath + ".cache"
+        try:
+            if os.stat(cache_path).st_mtime_ns < stat.st_mtime_ns:
+                return None
+            with open(cache_path, 'rb') as cache_file:
+                return _cache_loads(cache_file.read())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_cache_file(filepath: str, yaml_data: dict) -> None:
+        # Trees that don't survive the JSON round-trip (non-string keys,
+        # YAML-only types) just skip the cache rather than come back altered.
+        try:
+            payload = _cache_dumps(yaml_data)
+            if _cache_loads(payload) != yaml_data:
+                return
+        except (TypeError, ValueError):
+            return
+        # Write-then-rename keeps concurrent readers from ever seeing a
+        # half-written cache; read-only directories just skip the write.
+        cache_path = filepath + ".cache"
+        tmp_path = cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as cache_file:
+                cache_file.write(payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    def _load_yaml_data(self, yaml_data: dict, vault_fetcher: Any, target: dict = None) -> None:
+        # Iterative depth-first walk: no Python frame per nesting level and no
+        # RecursionError on pathologically deep configs.
+        stack = [(target if target is not None else self.data, yaml_data)]
+        while stack:
+            current, node = stack.pop()
+            for key, value in node.items():
+                # Configs reuse a small key vocabulary across sections and
+                # reloads; interning folds the duplicates PyYAML allocates and
+                # gives later dict lookups the pointer-equality fast path.
+                if type(key) is str:
+                    key = sys.intern(key)
+                # yaml.load only ever builds exact dict/str instances, so the
+                # C-level identity check beats isinstance's MRO walk here.
+                # Tests ordered by frequency: most config leaves are strings,
+                # then nested sections, then numeric leaves.
+                value_type = type(value)
+                if value_type is str:
+                    # One C-level scan classifies the value: partition yields
+                    # the marker head, then the table picks the handler.
+                    head, sep, _ = value.partition('.')
+                    handler = self._dispatch.get(head) if sep else None
+                    if handler is not None:
+                        handler(value, key, current)
+                    elif key not in current:
+                        # Short values (enums like 'stage', hostnames) repeat
+                        # across sections and reloads just like keys do; long
+                        # ones are rarely duplicated and not worth the hash.
+                        current[key] = sys.intern(value) if len(value) < 32 else value
+                elif value_type is dict:
+                    if self._has_markers(value):
+                        nested = {}
+                        current[key] = nested
+                        stack.append((nested, value))
+                    else:
+                        # Nothing to resolve below this point: adopt the parsed
+                        # subtree wholesale instead of rebuilding it dict by dict.
+                        current[key] = value
+                elif key not in current:
+                    current[key] = value
+
+    @staticmethod
+    def _has_markers(node: Any) -> bool:
+        if type(node) is dict:
+            return any(YamlLoader._has_markers(value) for value in node.values())
+        return type(node) is str and node.startswith(("ENV.", "VAULT."))
+
+    def _load_env_variable(self, yaml_value: str, key: str, target: dict = None) -> None:
+        if target is None:
+            target = self.data
+        # partition scans once and allocates only the tail we keep.
+        env_key = yaml_value.partition('.')[2]
+        target[key] = EnvLoader().load(env_key)
+
+    def _defer_vault_secret(self, yaml_value: str, key: str, target: dict) -> None:
+        _, vault_secret_path, vault_secret_key = yaml_value.split('.', 2)
+        self._pending_vault.append((target, key, vault_secret_path, vault_secret_key))
+
+    def _load_vault_secret(
+        self, vault_secret_path: str, vault_secret_key: str, key: str, vault_fetcher: Any, target: dict = None
+    ) -> None:
+        # Takes the already-split path/key so the marker string is only ever
+        # parsed once, by whoever classified it.
+        if target is None:
+            target = self.data
+        target[key] = VaultLoader().load(vault_secret_path, vault_secret_key, vault_fetcher)
+
+    def _resolve_pending_vault(self, vault_fetcher: Any) -> None:
+        if not self._pending_vault:
+            return
+        requests = [(path, vault_key) for _, _, path, vault_key in self._pending_vault]
+        values = VaultLoader().load_many(requests, vault_fetcher)
+        for target, key, path, vault_key in self._pending_vault:
+            target[key] = values[(path, vault_key)]
+        self._pending_vault = []
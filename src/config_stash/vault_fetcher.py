@@ -0,0 +1,44 @@
+import os
+from contextlib import contextmanager
+from typing import Any
+
+
+class VaultFetcher:
+    """Fetches secret values from a HashiCorp Vault server.
+
+    Requires the optional ``hvac`` dependency and the ``VAULT_ADDR`` and
+    ``VAULT_TOKEN`` environment variables to be set.
+    """
+
+    def __init__(self):
+        self._client = None
+
+    @contextmanager
+    def session(self):
+        """Reuse one Vault client (and its HTTP connection) for every fetch
+        issued inside the context."""
+        self._client = self._get_client()
+        try:
+            yield self
+        finally:
+            self._client = None
+
+    def get_value_from_vault(self, vault_secret_path: str, vault_secret_key: str) -> Any:
+        data = self.get_secret(vault_secret_path)
+        try:
+            return data[vault_secret_key]
+        except KeyError:
+            raise KeyError(f"Key {vault_secret_key} not found in Vault path {vault_secret_path}.") from None
+
+    def get_secret(self, vault_secret_path: str) -> dict:
+        """Read every key stored under a Vault path with a single request."""
+        client = self._get_client()
+        secret = client.secrets.kv.v2.read_secret_version(path=vault_secret_path)
+        return secret['data']['data']
+
+    def _get_client(self) -> Any:
+        if self._client is not None:
+            return self._client
+        import hvac
+
+        return hvac.Client(url=os.environ['VAULT_ADDR'], token=os.environ['VAULT_TOKEN'])
@@ -0,0 +1,209 @@
+import json
+import os
+
+import pytest
+
+from config_stash.config import Config
+
+
+class _StubVaultLoader:
+    """Hand-rolled VaultLoader double; cheaper per call than MagicMock and
+    the tests only need the return value and a call log."""
+
+    def __init__(self, value):
+        self._value = value
+        self.calls = []
+
+    def load(self, vault_secret_path, vault_secret_key, vault_fetcher):
+        self.calls.append((vault_secret_path, vault_secret_key, vault_fetcher))
+        return self._value
+
+
+class _StubVaultFetcher:
+    def __init__(self, secrets):
+        self._secrets = secrets
+
+    def get_secret(self, vault_secret_path):
+        return self._secrets[vault_secret_path]
+
+
+# The fixture data never changes, so it is serialized once at import time.
+# JSON is valid YAML, which keeps the per-test fixture cost at a plain
+# binary write instead of a PyYAML emitter run.
+_CONFIG_DATA = {
+    'url': 'stage',
+    'database': 'db_address',
+    'cloudaccessdb': {
+        'prefix_name': 'cloud_access',
+        'user': 'user',
+        'host': 'example.com',
+        'port': 1234,
+        'dbName': 'cloud_access',
+    },
+}
+_CONFIG_YAML = json.dumps(_CONFIG_DATA).encode()
+
+_ENV_VAULT_DATA = {
+    'url': 'stage',
+    'api_key': 'ENV.API_KEY',
+    'db_pass': 'VAULT.vault_secret_path.vault_secret_key',
+}
+_ENV_VAULT_YAML = json.dumps(_ENV_VAULT_DATA).encode()
+
+
+@pytest.fixture
+def temp_config_file(tmpdir):
+    filepath = tmpdir.join("config.yaml")
+    filepath.write_binary(_CONFIG_YAML)
+    return str(filepath)
+
+
+@pytest.fixture
+def temp_config_file_env_vault(tmpdir):
+    filepath = tmpdir.join("env_vault_config.yaml")
+    filepath.write_binary(_ENV_VAULT_YAML)
+    return str(filepath)
+
+
+def test_update_environment_variable_from_config():
+    config = Config()
+    config["MY_KEY"] = "my_value"
+
+    assert os.environ["MY_KEY"] == "my_value"
+    assert config["MY_KEY"] == "my_value"
+
+
+def test_non_string_value_is_cast_to_string_in_environ():
+    config = Config()
+    config["MY_PORT"] = 1234
+
+    assert os.environ["MY_PORT"] == "1234"
+    assert config["MY_PORT"] == 1234
+
+
+def test_load_from_env(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+
+    config = Config()
+    config.load_from_env("API_KEY")
+
+    assert config["API_KEY"] == "default_api_key"
+
+
+def test_load_from_env_with_custom_key_name(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+
+    config = Config()
+    config.load_from_env("API_KEY", "api_key")
+
+    assert config["api_key"] == "default_api_key"
+
+
+def test_load_non_existent_envvar():
+    config = Config()
+
+    with pytest.raises(KeyError):
+        config.load_from_env("NON_EXISTENT_ENVVAR")
+
+
+def test_load_many_keys_from_env(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+    monkeypatch.setenv("DATABASE_URL", "default_database_url")
+
+    config = Config()
+    config.load_many_keys_from_env(["API_KEY", "DATABASE_URL"])
+
+    assert "API_KEY" in config
+    assert "DATABASE_URL" in config
+
+
+def test_load_list_of_envvars_with_one_invalid_value(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+
+    config = Config()
+
+    with pytest.raises(KeyError):
+        config.load_many_keys_from_env(["API_KEY", "NON_EXISTENT_ENVVAR"])
+
+    assert config["API_KEY"] == "default_api_key"
+    assert "NON_EXISTENT_ENVVAR" not in config
+
+
+def test_load_prefixed_envvars(monkeypatch):
+    monkeypatch.setenv("RM_API_KEY", "default_api_key")
+    monkeypatch.setenv("rainmaker_database_url", "default_database_url")
+
+    config = Config()
+    config.load_prefixed_env_vars(["Rainmaker", "RM", "rm", "rainmaker"])
+
+    assert "RM_API_KEY" in config
+    assert "rainmaker_database_url" in config
+
+
+def test_load_from_vault():
+    vault_loader = _StubVaultLoader("vault_secret_value")
+    vault_fetcher = object()
+
+    config = Config()
+    config.load_from_vault("vault_secret_path", "vault_secret_key", loader=vault_loader, vault_fetcher=vault_fetcher)
+
+    assert config["vault_secret_key"] == "vault_secret_value"
+    assert vault_loader.calls == [("vault_secret_path", "vault_secret_key", vault_fetcher)]
+
+
+def test_load_from_vault_lazy_defers_fetch_until_first_access():
+    vault_loader = _StubVaultLoader("vault_secret_value")
+    vault_fetcher = object()
+
+    config = Config()
+    config.load_from_vault(
+        "vault_secret_path", "vault_secret_key", loader=vault_loader, vault_fetcher=vault_fetcher, lazy=True
+    )
+
+    assert vault_loader.calls == []
+    assert config["vault_secret_key"] == "vault_secret_value"
+    assert vault_loader.calls == [("vault_secret_path", "vault_secret_key", vault_fetcher)]
+    assert os.environ["vault_secret_key"] == "vault_secret_value"
+
+
+def test_load_from_vault_with_custom_key_name():
+    vault_loader = _StubVaultLoader("vault_secret_value")
+
+    config = Config()
+    config.load_from_vault(
+        "vault_secret_path",
+        "vault_secret_key",
+        custom_key_name="db_pass",
+        loader=vault_loader,
+        vault_fetcher=object(),
+    )
+
+    assert config["db_pass"] == "vault_secret_value"
+
+
+def test_load_envvars_from_non_existent_file():
+    config = Config()
+
+    with pytest.raises(FileNotFoundError):
+        config.load_from_yaml_file("non_existent_file.yaml")
+
+
+def test_load_from_yaml_file(temp_config_file):
+    config = Config()
+    config.load_from_yaml_file(temp_config_file)
+
+    assert config["url"] == "stage"
+    assert config["database"] == "db_address"
+    assert os.environ["url"] == "stage"
+
+
+def test_load_from_yaml_file_envvars_prefixed_with_ENV_and_VAULT(monkeypatch, temp_config_file_env_vault):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+    vault_fetcher = _StubVaultFetcher({"vault_secret_path": {"vault_secret_key": "vault_secret_value"}})
+
+    config = Config()
+    config.load_from_yaml_file(temp_config_file_env_vault, vault_fetcher=vault_fetcher)
+
+    assert config["url"] == "stage"
+    assert config["api_key"] == "default_api_key"
+    assert config["db_pass"] == "vault_secret_value"
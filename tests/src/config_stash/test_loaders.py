@@ -0,0 +1,325 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+from config_stash import loaders
+from config_stash.loaders import EnvLoader
+from config_stash.loaders import MultipleEnvLoader
+from config_stash.loaders import PrefixedEnvLoader
+from config_stash.loaders import VaultLoader
+from config_stash.loaders import YamlLoader
+
+
+class _StubVaultFetcher:
+    """Hand-rolled VaultFetcher double.
+
+    Records calls on plain lists; MagicMock's attribute machinery is far
+    slower per call and these tests only ever need values and call logs.
+    """
+
+    def __init__(self, secrets):
+        self._secrets = secrets
+        self.calls = []
+        self.sessions = 0
+
+    @contextmanager
+    def session(self):
+        self.sessions += 1
+        yield self
+
+    def get_secret(self, vault_secret_path):
+        self.calls.append(vault_secret_path)
+        return self._secrets[vault_secret_path]
+
+    def get_value_from_vault(self, vault_secret_path, vault_secret_key):
+        self.calls.append((vault_secret_path, vault_secret_key))
+        return self._secrets[vault_secret_path][vault_secret_key]
+
+
+# The fixtures below are session-scoped: every test treats the data and the
+# files as read-only, so the YAML emission and disk write happen once per run.
+@pytest.fixture(scope="session")
+def config_data():
+    return {
+        'url': 'stage',
+        'database': 'db_address',
+        'cloudaccessdb': {
+            'prefix_name': 'cloud_access',
+            'user': 'user',
+            'host': 'example.com',
+            'port': 1234,
+            'dbName': 'cloud_access',
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def temp_config_file(tmp_path_factory, config_data):
+    filepath = tmp_path_factory.mktemp("cfg") / "config.yaml"
+    with open(filepath, 'w') as file:
+        yaml.dump(config_data, file, Dumper=_Dumper)
+    return str(filepath)
+
+
+@pytest.fixture(scope="session")
+def data_VAULT_and_ENV_in_nested_dict():
+    return {
+        'url': 'stage',
+        'cloud_access_db': {
+            'password': 'VAULT.vault_secret_path.vault_secret_key',
+            'user': 'ENV.DB_USER',
+            'host': 'example.com',
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def temp_config_file_nested_data(tmp_path_factory, data_VAULT_and_ENV_in_nested_dict):
+    filepath = tmp_path_factory.mktemp("cfg") / "nested_config.yaml"
+    with open(filepath, 'w') as file:
+        yaml.dump(data_VAULT_and_ENV_in_nested_dict, file, Dumper=_Dumper)
+    return str(filepath)
+
+
+@pytest.fixture(scope="session")
+def temp_file_with_int_values(tmp_path_factory):
+    filepath = tmp_path_factory.mktemp("cfg") / "int_config.yaml"
+    with open(filepath, 'w') as file:
+        yaml.dump({'port': 1234, 'timeout': 30}, file, Dumper=_Dumper)
+    return str(filepath)
+
+
+def test_load_from_env():
+    loader = EnvLoader(env={"API_KEY": "default_api_key"})
+
+    assert loader.load("API_KEY") == "default_api_key"
+
+
+def test_load_from_env_reads_process_environ(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+
+    loader = EnvLoader()
+
+    assert loader.load("API_KEY") == "default_api_key"
+
+
+def test_load_non_existent_envvar():
+    loader = EnvLoader()
+
+    with pytest.raises(KeyError):
+        loader.load("NON_EXISTENT_ENVVAR")
+
+
+def test_load_multiple_envvars():
+    loader = MultipleEnvLoader(env={"API_KEY": "default_api_key", "DATABASE_URL": "default_database_url"})
+    result = loader.load(["API_KEY", "DATABASE_URL"])
+
+    assert "API_KEY" in result
+    assert "DATABASE_URL" in result
+    assert result["API_KEY"] == "default_api_key"
+    assert result["DATABASE_URL"] == "default_database_url"
+
+
+def test_load_list_of_envvars_with_one_invalid_value(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+
+    loader = MultipleEnvLoader()
+
+    with pytest.raises(KeyError, match="NON_EXISTENT_ENVVAR"):
+        loader.load(["API_KEY", "NON_EXISTENT_ENVVAR"])
+
+
+def test_load_prefixed_envvars():
+    loader = PrefixedEnvLoader(env={"RM_API_KEY": "default_api_key", "rainmaker_database_url": "default_database_url"})
+    result = loader.load(["Rainmaker", "RM", "rm", "rainmaker"])
+
+    assert "RM_API_KEY" in result
+    assert "rainmaker_database_url" in result
+
+
+def test_load_prefixed_envvars_case_sensitive(monkeypatch):
+    monkeypatch.setenv("rm_api_key", "default_api_key")
+
+    loader = PrefixedEnvLoader()
+    result = loader.load(["RM"])
+
+    assert result == {}
+
+
+def test_load_prefixed_envvars_without_decoding(monkeypatch):
+    monkeypatch.setenv("RM_API_KEY", "default_api_key")
+
+    loader = PrefixedEnvLoader()
+    result = loader.load(["RM"], decode=False)
+
+    assert result[b"RM_API_KEY"] == b"default_api_key"
+
+
+def test_vault_loader():
+    vault_fetcher = _StubVaultFetcher({"vault_secret_path": {"vault_secret_key": "vault_secret_value"}})
+
+    loader = VaultLoader()
+    value = loader.load("vault_secret_path", "vault_secret_key", vault_fetcher)
+
+    assert value == "vault_secret_value"
+    assert vault_fetcher.calls == [("vault_secret_path", "vault_secret_key")]
+
+
+def test_vault_loader_caches_resolved_secrets():
+    vault_fetcher = _StubVaultFetcher({"vault_secret_path": {"vault_secret_key": "vault_secret_value"}})
+
+    loader = VaultLoader()
+    loader.load("vault_secret_path", "vault_secret_key", vault_fetcher)
+    loader.load("vault_secret_path", "vault_secret_key", vault_fetcher)
+
+    assert vault_fetcher.calls == [("vault_secret_path", "vault_secret_key")]
+
+    VaultLoader.invalidate_cache()
+    loader.load("vault_secret_path", "vault_secret_key", vault_fetcher)
+
+    assert len(vault_fetcher.calls) == 2
+
+
+def test_cached_env_loader(monkeypatch):
+    monkeypatch.setenv("API_KEY", "default_api_key")
+
+    loader = EnvLoader(cached=True)
+    assert loader.load("API_KEY") == "default_api_key"
+
+    monkeypatch.setenv("API_KEY", "changed_api_key")
+    assert loader.load("API_KEY") == "default_api_key"
+
+    EnvLoader.invalidate_cache()
+    assert loader.load("API_KEY") == "changed_api_key"
+
+
+def test_vault_loader_load_batch_uses_one_session():
+    vault_fetcher = _StubVaultFetcher({"path_one": {"key_one": "value_one"}, "path_two": {"key_two": "value_two"}})
+
+    loader = VaultLoader()
+    values = loader.load_batch([("path_one", "key_one"), ("path_two", "key_two")], vault_fetcher)
+
+    assert values == {("path_one", "key_one"): "value_one", ("path_two", "key_two"): "value_two"}
+    assert vault_fetcher.sessions == 1
+
+
+def test_load_envvars_from_non_existent_file():
+    loader = YamlLoader()
+
+    with pytest.raises(FileNotFoundError):
+        loader.load("non_existent_file.yaml")
+
+
+def test_load_from_yaml_file(temp_config_file):
+    loader = YamlLoader()
+    loader.load(temp_config_file)
+
+    data = loader.data
+    assert data["url"] == "stage"
+    assert data["database"] == "db_address"
+
+
+def test_yaml_cache_skips_reparsing(monkeypatch, temp_config_file):
+    monkeypatch.setenv("CONFIG_STASH_YAML_CACHE", "1")
+
+    loader = YamlLoader()
+    loader.load(temp_config_file)
+
+    # Clear the in-memory parse cache so the second load can only be served
+    # by the sidecar file.
+    loaders._YAML_CACHE.clear()
+    with patch("config_stash.loaders._yaml_load") as yaml_load_mock:
+        second_loader = YamlLoader()
+        second_loader.load(temp_config_file)
+
+    yaml_load_mock.assert_not_called()
+    assert second_loader.data == loader.data
+
+
+def test_load_calls_load_yaml_data(temp_config_file, config_data):
+    with patch.object(YamlLoader, "_load_yaml_data") as mock_load_yaml_data:
+        loader = YamlLoader()
+        loader.load(temp_config_file)
+
+    mock_load_yaml_data.assert_called_once_with(config_data, None)
+
+
+def test_multiple_nested_keys_from_yaml(temp_config_file):
+    loader = YamlLoader()
+    loader.load(temp_config_file)
+
+    data = loader.data
+    assert "cloudaccessdb" in data
+    assert data["cloudaccessdb"]["prefix_name"] == "cloud_access"
+    assert data["cloudaccessdb"]["port"] == 1234
+    assert data["cloudaccessdb"]["dbName"] == "cloud_access"
+
+
+def test_load_yaml_file_with_int_values(temp_file_with_int_values):
+    loader = YamlLoader()
+    loader.load(temp_file_with_int_values)
+
+    data = loader.data
+    assert data["port"] == 1234
+    assert data["timeout"] == 30
+
+
+def test_load_yaml_data_with_VAULT_and_ENV_in_nested_dict(monkeypatch, temp_config_file_nested_data):
+    monkeypatch.setenv("DB_USER", "db_user")
+    vault_fetcher = _StubVaultFetcher({"vault_secret_path": {"vault_secret_key": "vault_secret_value"}})
+
+    loader = YamlLoader()
+    loader.load(temp_config_file_nested_data, vault_fetcher)
+
+    data = loader.data
+    assert data["url"] == "stage"
+    assert data["cloud_access_db"]["password"] == "vault_secret_value"
+    assert data["cloud_access_db"]["user"] == "db_user"
+    assert data["cloud_access_db"]["host"] == "example.com"
+    assert vault_fetcher.calls == ["vault_secret_path"]
+
+
+def test_env_marker_with_name_starting_with_marker_characters(monkeypatch, tmpdir):
+    monkeypatch.setenv("VENDOR_URL", "vendor.example.com")
+    filepath = tmpdir.join("vendor_config.yaml")
+    with open(filepath, 'w') as file:
+        yaml.dump({'vendor_url': 'ENV.VENDOR_URL'}, file, Dumper=_Dumper)
+
+    loader = YamlLoader()
+    loader.load(str(filepath))
+
+    assert loader.data["vendor_url"] == "vendor.example.com"
+
+
+def test_load_many_matches_sequential_loads(tmp_path):
+    filepaths = []
+    for index in range(4):
+        filepath = tmp_path / f"config_{index}.yaml"
+        with open(filepath, 'w') as file:
+            yaml.dump({'name': f'service_{index}', 'port': 8000 + index}, file, Dumper=_Dumper)
+        filepaths.append(str(filepath))
+
+    expected = {filepath: dict(YamlLoader().load(filepath)) for filepath in filepaths}
+
+    loader = YamlLoader()
+    results = loader.load_many(filepaths)
+
+    assert results == expected
+
+
+def test_private_method_load_vault_secret():
+    vault_fetcher_mock = object()
+
+    with patch.object(VaultLoader, "load", return_value="vault_secret_value") as vault_loader_magic_mock:
+        loader = YamlLoader()
+        loader._load_vault_secret("vault_secret_path", "vault_secret_key", "db_pass", vault_fetcher_mock)
+
+    vault_loader_magic_mock.assert_called_once_with("vault_secret_path", "vault_secret_key", vault_fetcher_mock)
+    assert loader.data["db_pass"] == "vault_secret_value"